@@ -576,6 +576,45 @@ class GraphNavClient(BaseClient):
                          copy_request=False, **kwargs)
 
 
+    def download_waypoint_snapshot_bytes(self, waypoint_snapshot_id, download_images=False,
+                                         do_not_download_point_cloud=False, **kwargs):
+        """Download a specific waypoint snapshot from the server, without parsing it.
+
+        Args:
+            waypoint_snapshot_id: WaypointSnapshot string ID for which snapshot to download from robot.
+            download_images: Boolean indicating whether to include images in the download.
+            do_not_download_point_cloud: Boolean indicating if point cloud data should not be downloaded.
+        Returns:
+            The serialized WaypointSnapshot protobuf, as received from the robot.
+        Raises:
+            RpcError: Problem communicating with the robot
+            UnknownMapInformationError: Snapshot id not found
+        """
+        request = self._build_download_waypoint_snapshot_request(waypoint_snapshot_id,
+                                                                 download_images,
+                                                                 do_not_download_point_cloud)
+        return self.call(self._stub.DownloadWaypointSnapshot, request,
+                         value_from_response=_get_streamed_data,
+                         error_from_response=_download_waypoint_snapshot_stream_errors,
+                         copy_request=False, **kwargs)
+
+    def download_edge_snapshot_bytes(self, edge_snapshot_id, **kwargs):
+        """Download a specific edge snapshot from the server, without parsing it.
+
+        Args:
+            edge_snapshot_id: EdgeSnapshot string ID for which snapshot to download from robot.
+        Returns:
+            The serialized EdgeSnapshot protobuf, as received from the robot.
+        Raises:
+            RpcError: Problem communicating with the robot
+            UnknownMapInformationError: Snapshot id not found
+        """
+        request = self._build_download_edge_snapshot_request(edge_snapshot_id)
+        return self.call(self._stub.DownloadEdgeSnapshot, request,
+                         value_from_response=_get_streamed_data,
+                         error_from_response=_download_edge_snapshot_stream_errors,
+                         copy_request=False, **kwargs)
+
     def _write_bytes(self, filepath, filename, data):
         """Write data to a file."""
         os.makedirs(filepath, exist_ok=True)
@@ -995,6 +1034,11 @@ def _get_graph(response):
     return response.graph
 
 
+def _get_streamed_data(response):
+    """Reads a streamed response and returns the serialized data carried by its chunks."""
+    return b''.join(resp.chunk.data for resp in response)
+
+
 def _get_streamed_waypoint_snapshot(response):
     """Reads a streamed response to recreate a waypoint snapshot."""
     data = ''
@@ -285,6 +285,21 @@ class Robot(object):
         """
 
         # If a specific channel was not set, look up the authority so we can get a channel.
+        authority = self.get_service_authority(service_name)
+        return self.ensure_secure_channel(authority, options=options)
+
+    def get_service_authority(self, service_name):
+        """Get the authority used to reach the given service.
+
+        Args:
+            service_name: Name of the service in the directory.
+        Returns:
+            The authority of the service.
+        Raises:
+            RpcError: There was a problem communicating with the robot.
+            UnregisteredServiceNameError: service_name is unknown.
+        """
+
         # Get the authority from either
         #   1. The bootstrap authority for this client_class, if available
         #   2. The authority of a registered service with matching service_name in DirectoryService
@@ -301,20 +316,31 @@ class Robot(object):
         if not authority:
             raise UnregisteredServiceNameError(service_name)
 
-        return self.ensure_secure_channel(authority, options=options)
+        return authority
 
     def ensure_secure_channel(self, authority, options=[]):
         """Get the channel to access the given authority, creating it if it doesn't exist."""
         if authority in self.channels_by_authority:
             return self.channels_by_authority[authority]
 
+        channel = self.create_secure_channel(authority, options=options)
+        self.channels_by_authority[authority] = channel
+        return channel
+
+    def create_secure_channel(self, authority, options=[]):
+        """Create a new channel to access the given authority, without caching it.
+
+        Unlike ensure_secure_channel(), this always creates a new channel, for example to use
+        channel options that differ from the channel shared by this robot's clients. The channel is
+        not closed by shutdown(); the caller is responsible for closing it.
+        """
+        options = list(options)
         # Update max send/receive message lengths.
         if 'grpc.max_receive_message_length' not in [option[0] for option in options]:
             options.append(('grpc.max_receive_message_length', self.max_receive_message_length))
         if 'grpc.max_send_message_length' not in [option[0] for option in options]:
             options.append(('grpc.max_send_message_length', self.max_send_message_length))
 
-        # Channel doesn't exist, so create it.
         creds = bosdyn.client.channel.create_secure_channel_creds(self.cert,
                                                                   lambda: self.user_token)
         channel = bosdyn.client.channel.create_secure_channel(self.address,
@@ -322,7 +348,6 @@ class Robot(object):
                                                               authority, options=options)
         self.logger.debug('Created channel to %s at port %i with authority %s', self.address,
                           self._secure_channel_port, authority)
-        self.channels_by_authority[authority] = channel
         return channel
 
 
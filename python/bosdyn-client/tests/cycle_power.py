@@ -6,36 +6,114 @@
 
 """Simple tutorial inspecting and cycling power on robot."""
 
+import os
 import sys
+import threading
 
-import bosdyn.client
-import bosdyn.client.util
-from bosdyn.client.power import PowerClient
+# Authenticated robots already created in this process, keyed by hostname.
+_ROBOTS = {}
+# Keepalive channels used by the power clients, keyed by hostname.
+_KEEPALIVE_CHANNELS = {}
+_ROBOTS_LOCK = threading.Lock()
+
+# HTTP/2 keepalive settings so the connection to the robot survives idle periods between commands.
+_KEEPALIVE_CHANNEL_OPTIONS = [('grpc.keepalive_time_ms', 20000),
+                              ('grpc.keepalive_timeout_ms', 10000),
+                              ('grpc.keepalive_permit_without_calls', 1),
+                              ('grpc.http2.max_pings_without_data', 0),
+                              ('grpc.http2.min_time_between_pings_ms', 10000)]
+
+
+def get_power_client(hostname):
+    """Return a PowerClient for the robot at hostname, reusing it across calls in this process.
+
+    The sdk, robot, authentication and channel are only set up the first time a hostname is
+    requested. The client uses its own channel with keepalive pings enabled.
+    """
+    # Imported here so that importing this module does not load grpc and the bosdyn client.
+    import bosdyn.client
+    import bosdyn.client.util
+    from bosdyn.client.power import PowerClient
+
+    with _ROBOTS_LOCK:
+        if hostname not in _ROBOTS:
+            sdk = bosdyn.client.create_standard_sdk('PowerClient')
+            robot = sdk.create_robot(hostname)
+            bosdyn.client.util.authenticate(robot)
+            authority = robot.get_service_authority(PowerClient.default_service_name)
+            _KEEPALIVE_CHANNELS[hostname] = robot.create_secure_channel(
+                authority, options=_KEEPALIVE_CHANNEL_OPTIONS)
+            _ROBOTS[hostname] = robot
+        return _ROBOTS[hostname].ensure_client(PowerClient.default_service_name,
+                                               channel=_KEEPALIVE_CHANNELS[hostname])
+
+
+def shutdown_robots():
+    """Close the channels of every robot created by get_power_client()."""
+    with _ROBOTS_LOCK:
+        for channel in _KEEPALIVE_CHANNELS.values():
+            channel.close()
+        _KEEPALIVE_CHANNELS.clear()
+        for robot in _ROBOTS.values():
+            robot.shutdown()
+        _ROBOTS.clear()
+
+
+def batch_power_commands(power_client, request, power_command_id, lease=None, timeout=None):
+    """Dispatch a power command and a power command feedback request together.
+
+    The power service has no batch RPC, so both requests are issued asynchronously before either
+    is waited on. This way the two calls share the channel concurrently instead of paying for two
+    sequential round trips.
+
+    Args:
+        timeout: Deadline in seconds applied to each RPC. Default None uses the client default.
+
+    Returns:
+        Tuple of (power command future, power command feedback future).
+    """
+    kwargs = {} if timeout is None else {'timeout': timeout}
+    command_future = power_client.power_command_async(request, lease=lease, **kwargs)
+    feedback_future = power_client.power_command_feedback_async(power_command_id, **kwargs)
+    return command_future, feedback_future
 
 
 def main():
     import argparse
+
+    import bosdyn.client
+    import bosdyn.client.util
     parser = argparse.ArgumentParser()
+    parser.add_argument('--rpc-timeout', type=float, help="Timeout of each RPC (seconds)",
+                        default=2.0)
     bosdyn.client.util.add_base_arguments(parser)
     options = parser.parse_args()
 
-    # Create robot object with a power client.
-    sdk = bosdyn.client.create_standard_sdk('PowerClient')
-    robot = sdk.create_robot(options.hostname)
-    bosdyn.client.util.authenticate(robot)
-    power_client = robot.ensure_client(PowerClient.default_service_name)
+    # Get the shared power client for this robot.
+    power_client = get_power_client(options.hostname)
+
+    command_future, feedback_future = batch_power_commands(power_client, request=None,
+                                                           power_command_id=1337,
+                                                           timeout=options.rpc_timeout)
 
     try:
-        power_client.power_command(lease=None, request=None)
-    except bosdyn.client.LeaseUseError as e:
+        command_future.result()
+    except (bosdyn.client.LeaseUseError, bosdyn.client.TimedOutError) as e:
         print("{}".format(e))
 
     try:
-        power_client.power_command_feedback(1337)
-    except bosdyn.client.InvalidRequestError as e:
+        feedback_future.result()
+    except (bosdyn.client.InvalidRequestError, bosdyn.client.TimedOutError) as e:
         print("{}".format(e))
 
+    return True
+
 
 if __name__ == "__main__":
-    if not main():
-        sys.exit(1)
+    ok = main()
+    # Close the channels explicitly and skip interpreter teardown, which would otherwise wait on
+    # grpc channel finalization for this one-shot script.
+    shutdown_robots()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(0 if ok else 1)
@@ -41,6 +41,9 @@ class MockGraphNavServicer(graph_nav_service_pb2_grpc.GraphNavServiceServicer):
             status=graph_nav_pb2.UploadGraphResponse.STATUS_OK)
         self.download_wp_snapshot_status = graph_nav_pb2.DownloadWaypointSnapshotResponse.STATUS_OK
         self.download_edge_snapshot_status = graph_nav_pb2.DownloadEdgeSnapshotResponse.STATUS_OK
+        self.waypoint_snapshot = map_pb2.WaypointSnapshot()
+        self.edge_snapshot = map_pb2.EdgeSnapshot()
+        self.snapshot_chunk_size = None  # None streams each snapshot in a single chunk.
         self.lease_use_result = None
 
     def SetLocalization(self, request, context):
@@ -111,16 +114,28 @@ class MockGraphNavServicer(graph_nav_service_pb2_grpc.GraphNavServiceServicer):
         return resp
 
     def DownloadWaypointSnapshot(self, request, context):
-        resp = graph_nav_pb2.DownloadWaypointSnapshotResponse()
-        resp.header.error.code = self.common_header_code
-        resp.status = self.download_wp_snapshot_status
-        yield resp
+        for chunk in self._chunk_data(self.waypoint_snapshot.SerializeToString()):
+            resp = graph_nav_pb2.DownloadWaypointSnapshotResponse()
+            resp.header.error.code = self.common_header_code
+            resp.status = self.download_wp_snapshot_status
+            resp.chunk.data = chunk
+            yield resp
 
     def DownloadEdgeSnapshot(self, request, context):
-        resp = graph_nav_pb2.DownloadEdgeSnapshotResponse()
-        resp.header.error.code = self.common_header_code
-        resp.status = self.download_edge_snapshot_status
-        yield resp
+        for chunk in self._chunk_data(self.edge_snapshot.SerializeToString()):
+            resp = graph_nav_pb2.DownloadEdgeSnapshotResponse()
+            resp.header.error.code = self.common_header_code
+            resp.status = self.download_edge_snapshot_status
+            resp.chunk.data = chunk
+            yield resp
+
+    def _chunk_data(self, data):
+        if not self.snapshot_chunk_size or not data:
+            return [data]
+        return [
+            data[i:i + self.snapshot_chunk_size]
+            for i in range(0, len(data), self.snapshot_chunk_size)
+        ]
 
 
 @pytest.fixture
@@ -420,3 +435,49 @@ def test_download_edge_snapshot(client, service, server):
     service.download_edge_snapshot_status = graph_nav_pb2.DownloadEdgeSnapshotResponse.STATUS_SNAPSHOT_DOES_NOT_EXIST
     with pytest.raises(bosdyn.client.graph_nav.UnknownMapInformationError):
         make_call()
+
+
+def test_download_waypoint_snapshot_bytes(client, service, server):
+    make_call = lambda: client.download_waypoint_snapshot_bytes(waypoint_snapshot_id="mywaypoint")
+    assert make_call() == map_pb2.WaypointSnapshot().SerializeToString()
+
+    # A non-empty snapshot streamed across several chunks is joined back together.
+    service.waypoint_snapshot.id = 'mywaypoint'
+    service.waypoint_snapshot.robot_id.serial_number = 'spot-1234'
+    data = service.waypoint_snapshot.SerializeToString()
+    service.snapshot_chunk_size = len(data) // 3
+    assert make_call() == data
+    assert map_pb2.WaypointSnapshot.FromString(make_call()) == service.waypoint_snapshot
+    service.snapshot_chunk_size = None
+
+    service.common_header_code = header_pb2.CommonError.CODE_INTERNAL_SERVER_ERROR
+    with pytest.raises(InternalServerError):
+        make_call()
+
+    service.common_header_code = header_pb2.CommonError.CODE_OK
+    service.download_wp_snapshot_status = graph_nav_pb2.DownloadWaypointSnapshotResponse.STATUS_SNAPSHOT_DOES_NOT_EXIST
+    with pytest.raises(bosdyn.client.graph_nav.UnknownMapInformationError):
+        make_call()
+
+
+def test_download_edge_snapshot_bytes(client, service, server):
+    make_call = lambda: client.download_edge_snapshot_bytes(edge_snapshot_id="myedge")
+    assert make_call() == map_pb2.EdgeSnapshot().SerializeToString()
+
+    # A non-empty snapshot streamed across several chunks is joined back together.
+    service.edge_snapshot.id = 'myedge'
+    service.edge_snapshot.stances.add().timestamp.seconds = 5
+    data = service.edge_snapshot.SerializeToString()
+    service.snapshot_chunk_size = len(data) // 3
+    assert make_call() == data
+    assert map_pb2.EdgeSnapshot.FromString(make_call()) == service.edge_snapshot
+    service.snapshot_chunk_size = None
+
+    service.common_header_code = header_pb2.CommonError.CODE_INTERNAL_SERVER_ERROR
+    with pytest.raises(InternalServerError):
+        make_call()
+
+    service.common_header_code = header_pb2.CommonError.CODE_OK
+    service.download_edge_snapshot_status = graph_nav_pb2.DownloadEdgeSnapshotResponse.STATUS_SNAPSHOT_DOES_NOT_EXIST
+    with pytest.raises(bosdyn.client.graph_nav.UnknownMapInformationError):
+        make_call()
@@ -102,6 +102,25 @@ Spam, Spam, Spam, Spam!
         client = robot.ensure_client(service_name,
                                      channel=robot.ensure_secure_channel('the-knights-of-ni'))
 
+    def test_create_secure_channel(self):
+        sdk = self._create_sdk()
+        robot = self._create_robot(sdk, 'test-robot')
+        shared_channel = robot.ensure_secure_channel('the-knights-of-ni')
+        self.assertIs(shared_channel, robot.ensure_secure_channel('the-knights-of-ni'))
+        options = [('grpc.keepalive_time_ms', 20000)]
+        new_channel = robot.create_secure_channel('the-knights-of-ni', options=options)
+        self.assertIsNot(shared_channel, new_channel)
+        self.assertIs(shared_channel, robot.channels_by_authority['the-knights-of-ni'])
+        self.assertEqual([('grpc.keepalive_time_ms', 20000)], options)
+        new_channel.close()
+
+    def test_get_service_authority(self):
+        sdk = self._create_sdk()
+        robot = self._create_robot(sdk, 'test-robot')
+        self.assertEqual('auth.spot.robot', robot.get_service_authority('auth'))
+        robot.authorities_by_name['mock'] = 'mock.spot.robot'
+        self.assertEqual('mock.spot.robot', robot.get_service_authority('mock'))
+
     def test_load_robot_cert(self):
         sdk = bosdyn.client.Sdk()
         sdk.load_robot_cert()
@@ -25,6 +25,12 @@ from bosdyn.client.robot_command import RobotCommandClient, blocking_stand
 
 g_image_click = None
 g_image_display = None
+g_image_overlay = None
+g_last_redraw_time = 0.0
+g_mouse_pos = None
+
+# Minimum time between crosshair redraws while the mouse moves (seconds).
+REDRAW_PERIOD = 1.0 / 30
 
 
 def walk_to_object(config):
@@ -83,7 +89,7 @@ def walk_to_object(config):
             dtype = np.uint16
         else:
             dtype = np.uint8
-        img = np.fromstring(image.shot.image.data, dtype=dtype)
+        img = np.frombuffer(image.shot.image.data, dtype=dtype)
         if image.shot.image.format == image_pb2.Image.FORMAT_RAW:
             img = img.reshape(image.shot.image.rows, image.shot.image.cols)
         else:
@@ -100,6 +106,8 @@ def walk_to_object(config):
         cv2.imshow(image_title, g_image_display)
         while g_image_click is None:
             key = cv2.waitKey(1) & 0xFF
+            # Draw the latest mouse position if the callback skipped it.
+            draw_crosshair()
             if key == ord('q') or key == ord('Q'):
                 # Quit
                 print('"q" pressed, exiting.')
@@ -157,21 +165,44 @@ def walk_to_object(config):
 
 
 def cv_mouse_callback(event, x, y, flags, param):
-    global g_image_click, g_image_display
-    clone = g_image_display.copy()
+    global g_image_click, g_mouse_pos
     if event == cv2.EVENT_LBUTTONUP:
         g_image_click = (x, y)
     else:
-        # Draw some lines on the image.
-        #print('mouse', x, y)
-        color = (30, 30, 30)
-        thickness = 2
-        image_title = 'Click to walk up to something'
-        height = clone.shape[0]
-        width = clone.shape[1]
-        cv2.line(clone, (0, y), (width, y), color, thickness)
-        cv2.line(clone, (x, 0), (x, height), color, thickness)
-        cv2.imshow(image_title, clone)
+        g_mouse_pos = (x, y)
+        draw_crosshair()
+
+
+def draw_crosshair():
+    """Draw the crosshair at the latest mouse position, at most once every REDRAW_PERIOD."""
+    global g_image_display, g_image_overlay, g_last_redraw_time, g_mouse_pos
+    if g_mouse_pos is None:
+        return
+    # Mouse moves arrive far faster than the display refreshes, so skip redundant redraws. The
+    # position is kept and drawn by a later call, e.g. from the waitKey loop.
+    now = time.monotonic()
+    if now - g_last_redraw_time < REDRAW_PERIOD:
+        return
+    g_last_redraw_time = now
+    x, y = g_mouse_pos
+    g_mouse_pos = None
+
+    # Draw on a reused copy of the image instead of allocating a new one for every event.
+    if g_image_overlay is None or g_image_overlay.shape != g_image_display.shape:
+        g_image_overlay = np.empty_like(g_image_display)
+    np.copyto(g_image_overlay, g_image_display)
+    clone = g_image_overlay
+
+    # Draw some lines on the image.
+    #print('mouse', x, y)
+    color = (30, 30, 30)
+    thickness = 2
+    image_title = 'Click to walk up to something'
+    height = clone.shape[0]
+    width = clone.shape[1]
+    cv2.line(clone, (0, y), (width, y), color, thickness)
+    cv2.line(clone, (x, 0), (x, height), color, thickness)
+    cv2.imshow(image_title, clone)
 
 
 def arg_float(x):
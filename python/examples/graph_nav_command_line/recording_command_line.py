@@ -8,23 +8,40 @@
 import argparse
 import logging
 import os
+import queue
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import google.protobuf.timestamp_pb2
 import graph_nav_util
 import grpc
 from google.protobuf import wrappers_pb2 as wrappers
 
-import bosdyn.client.channel
 import bosdyn.client.util
 from bosdyn.api.graph_nav import map_pb2, map_processing_pb2, recording_pb2
 from bosdyn.client import ResponseError, RpcError, create_standard_sdk
 from bosdyn.client.graph_nav import GraphNavClient
 from bosdyn.client.map_processing import MapProcessingServiceClient
-from bosdyn.client.math_helpers import Quat, SE3Pose
+from bosdyn.client.math_helpers import SE3Pose
 from bosdyn.client.recording import GraphNavRecordingServiceClient
 
+# Maximum number of snapshots downloaded from the robot at the same time.
+MAX_CONCURRENT_SNAPSHOT_DOWNLOADS = 8
+
+# Maximum number of downloaded snapshots waiting to be written to disk. Downloads block while the
+# queue is full, so at most this many plus MAX_CONCURRENT_SNAPSHOT_DOWNLOADS snapshots are in
+# memory.
+MAX_PENDING_SNAPSHOT_WRITES = 32
+
+# HTTP/2 keepalive settings so the connection to the robot survives idle periods between commands.
+KEEPALIVE_CHANNEL_OPTIONS = [('grpc.keepalive_time_ms', 20000),
+                             ('grpc.keepalive_timeout_ms', 10000),
+                             ('grpc.keepalive_permit_without_calls', 1),
+                             ('grpc.http2.max_pings_without_data', 0),
+                             ('grpc.http2.min_time_between_pings_ms', 10000)]
+
 
 class RecordingInterface(object):
     """Recording service command line interface."""
@@ -41,8 +58,11 @@ class RecordingInterface(object):
         # Filepath for the location to put the downloaded graph and snapshots.
         self._download_filepath = os.path.join(download_filepath, 'downloaded_graph')
 
+        # Keepalive-enabled channels shared by the clients below. Maps authority to channel.
+        self._keepalive_channels = dict()
+
         # Set up the recording service client.
-        self._recording_client = self._robot.ensure_client(
+        self._recording_client = self._ensure_keepalive_client(
             GraphNavRecordingServiceClient.default_service_name)
 
         # Create the recording environment.
@@ -51,17 +71,23 @@ class RecordingInterface(object):
                 client_metadata=client_metadata))
 
         # Set up the graph nav service client.
-        self._graph_nav_client = robot.ensure_client(GraphNavClient.default_service_name)
+        self._graph_nav_client = self._ensure_keepalive_client(GraphNavClient.default_service_name)
 
-        self._map_processing_client = robot.ensure_client(
+        self._map_processing_client = self._ensure_keepalive_client(
             MapProcessingServiceClient.default_service_name)
 
         # Store the most recent knowledge of the state of the robot based on rpc calls.
         self._current_graph = None
+        self._current_waypoints_by_id = dict()  # maps id to waypoint in the current graph
         self._current_edges = dict()  #maps to_waypoint to list(from_waypoint)
         self._current_waypoint_snapshots = dict()  # maps id to waypoint snapshot
         self._current_edge_snapshots = dict()  # maps id to edge snapshot
         self._current_annotation_name_to_wp_id = dict()
+        # Whether the map on the robot may have changed since the graph was last downloaded. While
+        # recording, the robot keeps adding waypoints on its own, so this stays set until recording
+        # stops.
+        self._graph_dirty = True
+        self._is_recording = self._recording_client.get_record_status().is_recording
 
         # Add recording service properties to the command line dictionary.
         self._command_dictionary = {
@@ -78,6 +104,27 @@ class RecordingInterface(object):
             'a': self._optimize_anchoring
         }
 
+    def _ensure_keepalive_client(self, service_name):
+        """Create a client on a channel that sends keepalive pings, one channel per authority.
+
+        The robot's own channel to the authority stays open alongside the keepalive channel.
+        """
+        authority = self._robot.get_service_authority(service_name)
+        if authority not in self._keepalive_channels:
+            self._keepalive_channels[authority] = self._robot.create_secure_channel(
+                authority, options=KEEPALIVE_CHANNEL_OPTIONS)
+        return self._robot.ensure_client(service_name, channel=self._keepalive_channels[authority])
+
+    def shutdown(self):
+        """Close the keepalive channels created by this interface.
+
+        The robot still caches the clients bound to these channels, so this interface is not usable
+        after shutdown().
+        """
+        for channel in self._keepalive_channels.values():
+            channel.close()
+        self._keepalive_channels.clear()
+
     def should_we_start_recording(self):
         # Before starting to record, check the state of the GraphNav system.
         graph = self._graph_nav_client.download_graph()
@@ -98,6 +145,7 @@ class RecordingInterface(object):
 
     def _clear_map(self, *args):
         """Clear the state of the map on the robot, removing all waypoints and edges."""
+        self._graph_dirty = True
         return self._graph_nav_client.clear_graph()
 
     def _start_recording(self, *args):
@@ -111,6 +159,8 @@ class RecordingInterface(object):
         try:
             status = self._recording_client.start_recording(
                 recording_environment=self._recording_environment)
+            self._is_recording = True
+            self._graph_dirty = True
             print('Successfully started recording a map.')
         except Exception as err:
             print(f'Start recording failed: {err}')
@@ -121,6 +171,8 @@ class RecordingInterface(object):
         while True:
             try:
                 status = self._recording_client.stop_recording()
+                self._is_recording = False
+                self._graph_dirty = True
                 print('Successfully stopped recording a map.')
                 break
             except bosdyn.client.recording.NotReadyYetError as err:
@@ -146,6 +198,7 @@ class RecordingInterface(object):
     def _create_default_waypoint(self, *args):
         """Create a default waypoint at the robot's current location."""
         resp = self._recording_client.create_waypoint(waypoint_name='default')
+        self._graph_dirty = True
         if resp.status == recording_pb2.CreateWaypointResponse.STATUS_OK:
             print('Successfully created a waypoint.')
         else:
@@ -167,69 +220,116 @@ class RecordingInterface(object):
     def _write_full_graph(self, graph):
         """Download the graph from robot to the specified, local filepath location."""
         graph_bytes = graph.SerializeToString()
+        os.makedirs(self._download_filepath, exist_ok=True)
         self._write_bytes(self._download_filepath, 'graph', graph_bytes)
 
     def _download_and_write_waypoint_snapshots(self, waypoints):
         """Download the waypoint snapshots from robot to the specified, local filepath location."""
-        num_waypoint_snapshots_downloaded = 0
-        for waypoint in waypoints:
-            if len(waypoint.snapshot_id) == 0:
-                continue
-            try:
-                waypoint_snapshot = self._graph_nav_client.download_waypoint_snapshot(
-                    waypoint.snapshot_id)
-            except Exception:
-                # Failure in downloading waypoint snapshot. Continue to next snapshot.
-                print(f'Failed to download waypoint snapshot: {waypoint.snapshot_id}')
-                continue
-            self._write_bytes(os.path.join(self._download_filepath, 'waypoint_snapshots'),
-                              str(waypoint.snapshot_id), waypoint_snapshot.SerializeToString())
-            num_waypoint_snapshots_downloaded += 1
-            print(
-                f'Downloaded {num_waypoint_snapshots_downloaded} of the total {len(waypoints)} waypoint snapshots.'
-            )
+        snapshot_ids = [
+            waypoint.snapshot_id for waypoint in waypoints if len(waypoint.snapshot_id) > 0
+        ]
+        self._download_and_write_snapshots(
+            self._graph_nav_client.download_waypoint_snapshot_bytes, snapshot_ids,
+            'waypoint_snapshots', 'waypoint', len(waypoints))
 
     def _download_and_write_edge_snapshots(self, edges):
         """Download the edge snapshots from robot to the specified, local filepath location."""
-        num_edge_snapshots_downloaded = 0
-        num_to_download = 0
-        for edge in edges:
-            if len(edge.snapshot_id) == 0:
-                continue
-            num_to_download += 1
-            try:
-                edge_snapshot = self._graph_nav_client.download_edge_snapshot(edge.snapshot_id)
-            except Exception:
-                # Failure in downloading edge snapshot. Continue to next snapshot.
-                print(f'Failed to download edge snapshot: {edge.snapshot_id}')
-                continue
-            self._write_bytes(os.path.join(self._download_filepath, 'edge_snapshots'),
-                              str(edge.snapshot_id), edge_snapshot.SerializeToString())
-            num_edge_snapshots_downloaded += 1
-            print(
-                f'Downloaded {num_edge_snapshots_downloaded} of the total {num_to_download} edge snapshots.'
-            )
+        snapshot_ids = [edge.snapshot_id for edge in edges if len(edge.snapshot_id) > 0]
+        self._download_and_write_snapshots(self._graph_nav_client.download_edge_snapshot_bytes,
+                                           snapshot_ids, 'edge_snapshots', 'edge',
+                                           len(snapshot_ids))
+
+    def _download_and_write_snapshots(self, download_snapshot, snapshot_ids, dirname,
+                                      snapshot_type, num_total):
+        """Download snapshots in parallel while a separate thread writes them to disk.
+
+        Args:
+            download_snapshot: GraphNavClient method returning the serialized snapshot for an id.
+            snapshot_ids: Ids of the snapshots to download.
+            dirname: Directory, relative to the download filepath, to write the snapshots into.
+            snapshot_type: Kind of snapshot ('waypoint' or 'edge'), used in progress messages.
+            num_total: Total count reported in progress messages.
+        """
+        filepath = os.path.join(self._download_filepath, dirname)
+        os.makedirs(filepath, exist_ok=True)
+        write_queue = queue.Queue(maxsize=MAX_PENDING_SNAPSHOT_WRITES)
+
+        def write_snapshots():
+            # Write (filename, data) items until the None sentinel is received.
+            while True:
+                item = write_queue.get()
+                if item is None:
+                    return
+                filename, data = item
+                try:
+                    self._write_bytes(filepath, filename, data)
+                except Exception as err:
+                    print(f'Failed to write {snapshot_type} snapshot {filename}: {err}')
+
+        def download_and_queue(snapshot_id):
+            # Queue from the worker so that a full queue holds back further downloads.
+            write_queue.put((str(snapshot_id), download_snapshot(snapshot_id)))
+
+        writer = threading.Thread(target=write_snapshots, daemon=True)
+        writer.start()
+        num_snapshots_downloaded = 0
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SNAPSHOT_DOWNLOADS) as executor:
+                futures = {
+                    executor.submit(download_and_queue, snapshot_id): snapshot_id
+                    for snapshot_id in snapshot_ids
+                }
+                try:
+                    for future in as_completed(futures):
+                        snapshot_id = futures[future]
+                        if future.exception() is not None:
+                            # Failure in downloading snapshot. Continue to next snapshot.
+                            print(f'Failed to download {snapshot_type} snapshot: {snapshot_id}')
+                            continue
+                        num_snapshots_downloaded += 1
+                        print(
+                            f'Downloaded {num_snapshots_downloaded} of the total {num_total} {snapshot_type} snapshots.'
+                        )
+                except BaseException:
+                    # Do not start the remaining downloads, e.g. after Ctrl-C.
+                    for f in futures:
+                        f.cancel()
+                    raise
+        finally:
+            write_queue.put(None)
+            writer.join()
 
     def _write_bytes(self, filepath, filename, data):
-        """Write data to a file."""
-        os.makedirs(filepath, exist_ok=True)
-        with open(os.path.join(filepath, filename), 'wb+') as f:
+        """Write data to a file in an existing directory."""
+        with open(os.path.join(filepath, filename), 'wb') as f:
             f.write(data)
-            f.close()
 
     def _update_graph_waypoint_and_edge_ids(self, do_print=False):
+        # Reuse the last downloaded graph if nothing this client did could have changed it.
+        if not do_print and not self._graph_dirty:
+            return
+
         # Download current graph
         graph = self._graph_nav_client.download_graph()
         if graph is None:
             print('Empty graph.')
             return
-        self._current_graph = graph
+        self._set_current_graph(graph)
 
         localization_id = self._graph_nav_client.get_localization_state().localization.waypoint_id
 
         # Update and print waypoints and edges
         self._current_annotation_name_to_wp_id, self._current_edges = graph_nav_util.update_waypoints_and_edges(
             graph, localization_id, do_print)
+        self._graph_dirty = self._is_recording
+
+    def _set_current_graph(self, graph):
+        """Store the graph and index its waypoints by id."""
+        self._current_graph = graph
+        if graph is None:
+            self._current_waypoints_by_id = dict()
+        else:
+            self._current_waypoints_by_id = {waypoint.id: waypoint for waypoint in graph.waypoints}
 
     def _list_graph_waypoint_and_edge_ids(self, *args):
         """List the waypoint ids and edge ids of the graph currently on the robot."""
@@ -272,6 +372,7 @@ class RecordingInterface(object):
 
         # Send request to add edge to map
         self._recording_client.create_edge(edge=new_edge)
+        self._graph_dirty = True
 
     def _create_loop(self, *args):
         """Create edge from last waypoint to first waypoint."""
@@ -301,7 +402,8 @@ class RecordingInterface(object):
             inputs = input('>')
         except NameError:
             return
-        req_type = str.split(inputs)[0]
+        tokens = inputs.split()
+        req_type = tokens[0] if tokens else ''
         close_fiducial_loops = False
         close_odometry_loops = False
         if req_type == '0':
@@ -325,6 +427,7 @@ class RecordingInterface(object):
                 do_fiducial_loop_closure=wrappers.BoolValue(value=close_fiducial_loops),
                 do_odometry_loop_closure=wrappers.BoolValue(value=close_odometry_loops)),
             modify_map_on_server=True)
+        self._graph_dirty = True
         print(f'Created {len(response.new_subgraph.edges)} new edge(s).')
 
     def _optimize_anchoring(self, *args):
@@ -333,13 +436,14 @@ class RecordingInterface(object):
             params=map_processing_pb2.ProcessAnchoringRequest.Params(),
             modify_anchoring_on_server=True, stream_intermediate_results=False,
             apply_gps_results=self.use_gps)
+        self._graph_dirty = True
         if response.status == map_processing_pb2.ProcessAnchoringResponse.STATUS_OK:
             print(f'Optimized anchoring after {response.iteration} iteration(s).')
             # If we are using GPS, the GPS coordinates in the graph have been changed, so we need
             # to re-download the graph.
             if self.use_gps:
                 print(f'Downloading updated graph...')
-                self._current_graph = self._graph_nav_client.download_graph()
+                self._set_current_graph(self._graph_nav_client.download_graph())
         else:
             print(f'Error optimizing {response}')
 
@@ -347,29 +451,18 @@ class RecordingInterface(object):
         """Get waypoint from graph (return None if waypoint not found)"""
 
         if self._current_graph is None:
-            self._current_graph = self._graph_nav_client.download_graph()
-
-        for waypoint in self._current_graph.waypoints:
-            if waypoint.id == id:
-                return waypoint
+            self._set_current_graph(self._graph_nav_client.download_graph())
 
-        print(f'ERROR: Waypoint {id} not found in graph.')
-        return None
+        waypoint = self._current_waypoints_by_id.get(id)
+        if waypoint is None:
+            print(f'ERROR: Waypoint {id} not found in graph.')
+        return waypoint
 
     def _get_transform(self, from_wp, to_wp):
         """Get transform from from-waypoint to to-waypoint."""
 
-        from_se3 = from_wp.waypoint_tform_ko
-        from_tf = SE3Pose(
-            from_se3.position.x, from_se3.position.y, from_se3.position.z,
-            Quat(w=from_se3.rotation.w, x=from_se3.rotation.x, y=from_se3.rotation.y,
-                 z=from_se3.rotation.z))
-
-        to_se3 = to_wp.waypoint_tform_ko
-        to_tf = SE3Pose(
-            to_se3.position.x, to_se3.position.y, to_se3.position.z,
-            Quat(w=to_se3.rotation.w, x=to_se3.rotation.x, y=to_se3.rotation.y,
-                 z=to_se3.rotation.z))
+        from_tf = SE3Pose.from_proto(from_wp.waypoint_tform_ko)
+        to_tf = SE3Pose.from_proto(to_wp.waypoint_tform_ko)
 
         from_T_to = from_tf.mult(to_tf.inverse())
         return from_T_to.to_proto()
@@ -392,11 +485,13 @@ class RecordingInterface(object):
             (a) Optimize the map's anchoring.
             (q) Exit.
             """)
+            inputs = ''
             try:
                 inputs = input('>')
             except NameError:
                 pass
-            req_type = str.split(inputs)[0]
+            tokens = inputs.split()
+            req_type = tokens[0] if tokens else ''
 
             if req_type == 'q':
                 break
@@ -406,7 +501,7 @@ class RecordingInterface(object):
                 continue
             try:
                 cmd_func = self._command_dictionary[req_type]
-                cmd_func(str.split(inputs)[1:])
+                cmd_func(tokens[1:])
             except Exception as e:
                 print(e)
 
@@ -458,6 +553,8 @@ def main():
         print(exc)
         print('Recording command line client threw an error.')
         return False
+    finally:
+        recording_command_line.shutdown()
 
 
 if __name__ == '__main__':
@@ -147,9 +147,10 @@ def get_hand_color_image(image_client):
         dtype = np.uint16
     else:
         dtype = np.uint8
-    img = np.fromstring(image.shot.image.data, dtype=dtype)
+    img = np.frombuffer(image.shot.image.data, dtype=dtype)
     if image.shot.image.format == image_pb2.Image.FORMAT_RAW:
-        img = img.reshape(image.shot.image.rows, image.shot.image.cols)
+        # Copy since np.frombuffer is read-only and draw_lines() draws into the image.
+        img = img.reshape(image.shot.image.rows, image.shot.image.cols).copy()
     else:
         img = cv2.imdecode(img, -1)
 
@@ -158,7 +159,6 @@ def get_hand_color_image(image_client):
 
 def cv_mouse_callback(event, x, y, flags, param):
     global g_image_click, g_image_display, g_mouse_pos
-    clone = g_image_display.copy()
     if event == cv2.EVENT_LBUTTONUP:
         g_image_click = (x, y)
     else: